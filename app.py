@@ -1,18 +1,67 @@
+import signal
+import asyncio
+import logging
+
 from aiogram import executor
 
-from loader import dp
+from data.config import SHUTDOWN_TIMEOUT
+from loader import dp, error_reporter, health
 import middlewares, filters, handlers
+from handlers.users.start import warm_up_assets
 from utils.notify_admins import on_startup_notify
 from utils.set_bot_commands import set_default_commands
 
 
 async def on_startup(dispatcher):
+    # /health va /ready endpointlari
+    await health.start()
+
     # Birlamchi komandalar (/star va /help)
     await set_default_commands(dispatcher)
 
     # Bot ishga tushgani haqida adminga xabar berish
     await on_startup_notify(dispatcher)
 
+    # Xatoliklar hisobotini adminlarga yuborib turish
+    error_reporter.start()
+
+    # Font, logo va rasm yaratishni oldindan yuklash
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, warm_up_assets)
+    health.assets_warm = True
+
+    # SIGTERM (docker stop) kelganda loop to'xtatiladi va on_shutdown ishlaydi.
+    # Oxirida o'rnatiladi: loop.stop() run_until_complete ichida chaqirilsa executor xato beradi
+    try:
+        loop.add_signal_handler(signal.SIGTERM, loop.stop)
+    except NotImplementedError:
+        # Windows da signal handler qo'llab-quvvatlanmaydi
+        pass
+
+
+async def on_shutdown(dispatcher):
+    # Takroriy SIGTERM to'xtatish jarayonini (loop.stop) bo'lib qo'ymasligi uchun
+    try:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGTERM)
+    except NotImplementedError:
+        pass
+
+    # Readiness 503 qaytaradi, yangi update lar olinmaydi
+    health.shutting_down = True
+
+    # Polling ni to'xtatib, olingan va navbatdagi update larni kutish. Storage va
+    # sessiya shundan keyin yopiladi
+    if not await dispatcher.close_polling(SHUTDOWN_TIMEOUT):
+        logging.warning(f"Update lar {SHUTDOWN_TIMEOUT} soniyada tugamadi: {dispatcher.scheduler.stats()}")
+
+    # Yig'ilgan xatoliklar hisobotini yuborish
+    await error_reporter.close()
+    await health.close()
+
+    # Loglarni diskka yozish (FSM holatlari storage.close() da saqlanadi)
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
 
 if __name__ == '__main__':
-    executor.start_polling(dp, on_startup=on_startup)
+    executor.start_polling(dp, on_startup=on_startup, on_shutdown=on_shutdown)
@@ -7,3 +7,9 @@ env.read_env()
 BOT_TOKEN = env.str("BOT_TOKEN")  # Bot toekn
 ADMINS = env.list("ADMINS")  # adminlar ro'yxati
 IP = env.str("ip")  # Xosting ip manzili
+UPDATE_CONCURRENCY = env.int("UPDATE_CONCURRENCY", 8)  # bir vaqtda ishlanadigan update lar soni
+RENDER_CONCURRENCY = env.int("RENDER_CONCURRENCY", 2)  # shulardan rasm/fayl yaratadiganlari soni
+ERROR_DIGEST_INTERVAL = env.int("ERROR_DIGEST_INTERVAL", 60)  # xatoliklar hisoboti oralig'i (soniya)
+FSM_STORAGE_PATH = env.str("FSM_STORAGE_PATH", "data/fsm_storage.json")  # FSM holatlari saqlanadigan fayl
+HEALTH_PORT = env.int("HEALTH_PORT", 8080)  # /health va /ready endpointlari porti
+SHUTDOWN_TIMEOUT = env.int("SHUTDOWN_TIMEOUT", 25)  # to'xtatishda update larni kutish vaqti (soniya)
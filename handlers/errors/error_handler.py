@@ -1,58 +1,25 @@
-import logging
-from aiogram.utils.exceptions import (Unauthorized, InvalidQueryID, TelegramAPIError,
-                                      CantDemoteChatCreator, MessageNotModified, MessageToDeleteNotFound,
-                                      MessageTextIsEmpty, RetryAfter,
-                                      CantParseEntities, MessageCantBeDeleted)
+from aiogram.utils.exceptions import (Unauthorized, InvalidQueryID, CantDemoteChatCreator, MessageNotModified,
+                                      MessageToDeleteNotFound, MessageTextIsEmpty, MessageCantBeDeleted)
 
 
-from loader import dp
+from loader import dp, error_reporter
+
+# Adminlarga xabar berish shart bo'lmagan, kutiladigan xatoliklar
+# (Unauthorized - foydalanuvchi botni bloklagan, InvalidQueryID - callback javobi kechikkan)
+SILENT_EXCEPTIONS = (Unauthorized, InvalidQueryID, CantDemoteChatCreator, MessageNotModified,
+                     MessageCantBeDeleted, MessageToDeleteNotFound, MessageTextIsEmpty)
 
 
 @dp.errors_handler()
 async def errors_handler(update, exception):
     """
     Exceptions handler. Catches all exceptions within task factory tasks.
-    :param dispatcher:
+    Exceptions are grouped by type and location, logged once per window
+    and reported to admins as a periodic digest.
     :param update:
     :param exception:
-    :return: stdout logging
+    :return: True (exception is handled)
     """
 
-    if isinstance(exception, CantDemoteChatCreator):
-        logging.exception("Can't demote chat creator")
-        return True
-
-    if isinstance(exception, MessageNotModified):
-        logging.exception('Message is not modified')
-        return True
-    if isinstance(exception, MessageCantBeDeleted):
-        logging.exception('Message cant be deleted')
-        return True
-
-    if isinstance(exception, MessageToDeleteNotFound):
-        logging.exception('Message to delete not found')
-        return True
-
-    if isinstance(exception, MessageTextIsEmpty):
-        logging.exception('MessageTextIsEmpty')
-        return True
-
-    if isinstance(exception, Unauthorized):
-        logging.exception(f'Unauthorized: {exception}')
-        return True
-
-    if isinstance(exception, InvalidQueryID):
-        logging.exception(f'InvalidQueryID: {exception} \nUpdate: {update}')
-        return True
-
-    if isinstance(exception, TelegramAPIError):
-        logging.exception(f'TelegramAPIError: {exception} \nUpdate: {update}')
-        return True
-    if isinstance(exception, RetryAfter):
-        logging.exception(f'RetryAfter: {exception} \nUpdate: {update}')
-        return True
-    if isinstance(exception, CantParseEntities):
-        logging.exception(f'CantParseEntities: {exception} \nUpdate: {update}')
-        return True
-    
-    logging.exception(f'Update: {update} \n{exception}')
+    error_reporter.record(exception, update, notify=not isinstance(exception, SILENT_EXCEPTIONS))
+    return True
@@ -1,3 +1,4 @@
 from . import help
 from . import start
+from . import inline
 from . import echo
\ No newline at end of file
@@ -0,0 +1,124 @@
+import time
+import logging
+from collections import OrderedDict
+
+from aiogram import types
+
+from loader import dp
+from .start import (KOEFFITSIYENTLAR, DOIMIY_KURS, MAX_NARX, RASM_FILE_ID_CACHE, calculate_nasiya_all,
+                    format_number, format_natija_text, parse_dollar, rasm_cache_key)
+
+logger = logging.getLogger(__name__)
+
+# Telegram tomonida javobni keshlash vaqti (soniya)
+INLINE_CACHE_TIME = 300
+
+# Bot ichidagi oxirgi so'rovlar xotirasi
+INLINE_MEMO_TTL = INLINE_CACHE_TIME
+INLINE_MEMO_MAX = 512
+_inline_memo = OrderedDict()
+
+
+# =========================
+# YORDAMCHI FUNKSIYALAR
+# =========================
+
+def parse_inline_query(query):
+    """'1200 300' ko'rinishidagi so'rovdan narx va boshlang'ich to'lovni ajratish"""
+    parts = query.replace(',', '.').split()
+    if not 1 <= len(parts) <= 2:
+        return None
+
+    try:
+        umumiy_narx = parse_dollar(parts[0])
+        boshlangich_tolov = parse_dollar(parts[1]) if len(parts) == 2 else 0.0
+    except ValueError:
+        return None
+
+    # Chegaralar bot ichidagi hisoblash bilan bir xil
+    if not 0 < umumiy_narx <= MAX_NARX or boshlangich_tolov < 0 or boshlangich_tolov >= umumiy_narx:
+        return None
+
+    return umumiy_narx, boshlangich_tolov
+
+
+def memo_get(key):
+    """Xotiradan hali eskirmagan javobni olish"""
+    entry = _inline_memo.get(key)
+    if entry is None:
+        return None
+
+    saved_at, results = entry
+    if time.monotonic() - saved_at > INLINE_MEMO_TTL:
+        del _inline_memo[key]
+        return None
+
+    _inline_memo.move_to_end(key)
+    return results
+
+
+def memo_set(key, results):
+    """Javobni xotiraga saqlash (eng eskisini chiqarib tashlagan holda)"""
+    _inline_memo[key] = (time.monotonic(), results)
+    _inline_memo.move_to_end(key)
+    while len(_inline_memo) > INLINE_MEMO_MAX:
+        _inline_memo.popitem(last=False)
+
+
+def build_inline_results(umumiy_narx, boshlangich_tolov):
+    """Barcha muddatlar uchun inline natijalar ro'yxati"""
+    data = {'umumiy_narx': umumiy_narx, 'boshlangich_tolov': boshlangich_tolov}
+    results = []
+
+    for result in calculate_nasiya_all(umumiy_narx, boshlangich_tolov, DOIMIY_KURS, KOEFFITSIYENTLAR):
+        muddat = result['muddat']
+        natija = format_natija_text(data, result)
+        result_id = f"{umumiy_narx:g}_{boshlangich_tolov:g}_{muddat}"
+        title = f"{muddat} oy - oyiga {format_number(result['oylik_tolov'])} so'm"
+        description = f"Umumiy to'lov: {format_number(result['umumiy_tolov'])} so'm"
+
+        file_id = RASM_FILE_ID_CACHE.get(rasm_cache_key(umumiy_narx, boshlangich_tolov, muddat))
+        if file_id:
+            results.append(types.InlineQueryResultCachedPhoto(
+                id=result_id,
+                photo_file_id=file_id,
+                title=title,
+                description=description,
+                caption=natija,
+                parse_mode='HTML'
+            ))
+        else:
+            results.append(types.InlineQueryResultArticle(
+                id=result_id,
+                title=title,
+                description=description,
+                input_message_content=types.InputTextMessageContent(natija, parse_mode='HTML')
+            ))
+
+    return results
+
+
+# =========================
+# HANDLERLAR
+# =========================
+
+@dp.inline_handler()
+async def inline_nasiya(inline_query: types.InlineQuery):
+    """Inline rejimda tezkor hisoblash: @bot 1200 300"""
+    parsed = parse_inline_query(inline_query.query)
+
+    if parsed is None:
+        await inline_query.answer(
+            [],
+            cache_time=INLINE_CACHE_TIME,
+            switch_pm_text="Narx va boshlang'ich to'lovni kiriting: 1200 300",
+            switch_pm_parameter="inline"
+        )
+        return
+
+    results = memo_get(parsed)
+    if results is None:
+        results = build_inline_results(*parsed)
+        memo_set(parsed, results)
+
+    await inline_query.answer(results, cache_time=INLINE_CACHE_TIME)
@@ -1,6 +1,9 @@
 import os
 import io
+import math
+import asyncio
 import logging
+from functools import lru_cache
 from aiogram import Bot, Dispatcher, executor, types
 from aiogram.contrib.fsm_storage.memory import MemoryStorage
 from aiogram.dispatcher import FSMContext
@@ -10,6 +13,7 @@ from aiogram.types import ReplyKeyboardRemove, InlineKeyboardMarkup, InlineKeybo
 import requests
 
 from loader import dp, bot
+from utils.misc.schedule import build_schedule, export_schedule, available_formats, round_som
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -22,6 +26,9 @@ except ImportError:
 # Doimiy kurs
 DOIMIY_KURS = 12050
 
+# Kiritiladigan narxning yuqori chegarasi (USD)
+MAX_NARX = 10_000_000
+
 # Muddat uchun koeffitsiyentlar
 KOEFFITSIYENTLAR = {
     3: 16000,
@@ -29,6 +36,10 @@ KOEFFITSIYENTLAR = {
     6: 18000
 }
 
+# Yuborilgan natija rasmlarining Telegram file_id lari (inline rejim uchun)
+RASM_FILE_ID_CACHE = {}
+RASM_FILE_ID_CACHE_MAX = 1000
+
 # =========================
 # LOGGING SOZLASH
 # =========================
@@ -63,28 +74,100 @@ def format_number(num):
     return "{:,.0f}".format(num).replace(',', ' ')
 
 
+def parse_dollar(text):
+    """Foydalanuvchi kiritgan USD summani o'qish (sentgacha yaxlitlanadi)"""
+    summa = float(text.replace(' ', '').replace(',', '.'))
+    # float() 'nan' va 'inf' ni ham qabul qiladi
+    if not math.isfinite(summa):
+        raise ValueError(f"Noto'g'ri summa: {text}")
+    # Jadval tugmasining callback_data si summani 2 xonagacha saqlaydi - rasm va
+    # jadval bir xil summadan hisoblanishi uchun kiritilgan qiymat ham shunday yaxlitlanadi
+    return round(summa, 2)
+
+
 def calculate_nasiya(umumiy_narx, boshlangich_tolov, kurs, muddat):
     """Nasiya to'lovlarini hisoblash"""
+    return calculate_nasiya_all(umumiy_narx, boshlangich_tolov, kurs, (muddat,))[0]
+
+
+def calculate_nasiya_all(umumiy_narx, boshlangich_tolov, kurs, muddatlar):
+    """Bir nechta muddat uchun nasiya to'lovlarini hisoblash (qoldiq bir marta hisoblanadi)"""
     qoldiq_dollar = umumiy_narx - boshlangich_tolov
-    qoldiq_som = qoldiq_dollar * kurs
-    koeffitsiyent = KOEFFITSIYENTLAR[muddat]
-    umumiy_tolov = qoldiq_dollar * koeffitsiyent
-    qoshilgan_foyda = umumiy_tolov - qoldiq_som
-    oylik_tolov = umumiy_tolov / muddat
-    oyma_oy_foyda = qoshilgan_foyda / muddat
-    oylik_asosiy = qoldiq_som / muddat
-
-    return {
-        'qoldiq_dollar': qoldiq_dollar,
-        'qoldiq_som': qoldiq_som,
-        'koeffitsiyent': koeffitsiyent,
-        'umumiy_tolov': umumiy_tolov,
-        'qoshilgan_foyda': qoshilgan_foyda,
-        'oylik_tolov': oylik_tolov,
-        'oyma_oy_foyda': oyma_oy_foyda,
-        'oylik_asosiy': oylik_asosiy,
-        'muddat': muddat
-    }
+    # So'mdagi summalar butun so'mga yaxlitlanadi, umumiy to'lov ularning yig'indisi -
+    # rasm, matn va to'lov jadvali bir xil summalarni ko'rsatishi uchun
+    qoldiq_som = round_som(qoldiq_dollar * kurs)
+
+    natijalar = []
+    for muddat in muddatlar:
+        koeffitsiyent = KOEFFITSIYENTLAR[muddat]
+        qoshilgan_foyda = round_som(qoldiq_dollar * koeffitsiyent - qoldiq_dollar * kurs)
+        umumiy_tolov = qoldiq_som + qoshilgan_foyda
+        oylik_tolov = umumiy_tolov / muddat
+        oyma_oy_foyda = qoshilgan_foyda / muddat
+        oylik_asosiy = qoldiq_som / muddat
+
+        natijalar.append({
+            'qoldiq_dollar': qoldiq_dollar,
+            'qoldiq_som': qoldiq_som,
+            'koeffitsiyent': koeffitsiyent,
+            'umumiy_tolov': umumiy_tolov,
+            'qoshilgan_foyda': qoshilgan_foyda,
+            'oylik_tolov': oylik_tolov,
+            'oyma_oy_foyda': oyma_oy_foyda,
+            'oylik_asosiy': oylik_asosiy,
+            'muddat': muddat
+        })
+
+    return natijalar
+
+
+def format_natija_text(data, result):
+    """Natijani HTML matn ko'rinishida tayyorlash"""
+    natija = f"📊 <b>Nasiya hisoblash natijasi</b>\n\n"
+    natija += f"🔹 Umumiy narx: ${format_number(data.get('umumiy_narx', 0))}\n"
+    natija += f"🔹 Boshlang'ich to'lov: ${format_number(data.get('boshlangich_tolov', 0))}\n"
+    natija += f"🔹 Qoldiq: ${format_number(result['qoldiq_dollar'])}\n"
+    natija += f"🔹 Kurs: {format_number(DOIMIY_KURS)} so'm\n"
+    natija += f"🔹 Muddat: {result['muddat']} oy\n\n"
+
+    natija += f"💵 <b>Qoldiq (asosiy):</b> {format_number(result['qoldiq_som'])} so'm\n"
+    natija += f"➕ <b>Qo'shilgan summa:</b> {format_number(result['qoshilgan_foyda'])} so'm\n"
+    natija += f"💰 <b>Umumiy to'lov:</b> {format_number(result['umumiy_tolov'])} so'm\n\n"
+
+    natija += f"💸 <b>Oylik to'lov:</b> {format_number(result['oylik_tolov'])} so'm\n"
+    return natija
+
+
+def format_taqqoslash_text(data, results):
+    """Barcha muddatlarni taqqoslash natijasini HTML matn ko'rinishida tayyorlash"""
+    qoldiq_dollar = results[0]['qoldiq_dollar']
+    natija = f"📊 <b>Muddatlarni taqqoslash</b>\n\n"
+    natija += f"🔹 Umumiy narx: ${format_number(data.get('umumiy_narx', 0))}\n"
+    natija += f"🔹 Boshlang'ich to'lov: ${format_number(data.get('boshlangich_tolov', 0))}\n"
+    natija += f"🔹 Qoldiq: ${format_number(qoldiq_dollar)}\n"
+    natija += f"🔹 Kurs: {format_number(DOIMIY_KURS)} so'm\n"
+
+    for result in results:
+        natija += f"\n🗓 <b>{result['muddat']} oy</b>\n"
+        natija += f"➕ Qo'shilgan summa: {format_number(result['qoshilgan_foyda'])} so'm\n"
+        natija += f"💰 Umumiy to'lov: {format_number(result['umumiy_tolov'])} so'm\n"
+        natija += f"💸 <b>Oylik to'lov:</b> {format_number(result['oylik_tolov'])} so'm\n"
+
+    return natija
+
+
+def rasm_cache_key(umumiy_narx, boshlangich_tolov, muddat):
+    """Yuborilgan rasm file_id si uchun kalit"""
+    return (float(umumiy_narx), float(boshlangich_tolov), muddat)
+
+
+def remember_rasm_file_id(data, result, file_id):
+    """Yuborilgan rasm file_id sini keyinchalik qayta ishlatish uchun saqlash"""
+    if len(RASM_FILE_ID_CACHE) >= RASM_FILE_ID_CACHE_MAX:
+        # Eng eski yozuvni o'chirish (dict qo'shilish tartibini saqlaydi)
+        RASM_FILE_ID_CACHE.pop(next(iter(RASM_FILE_ID_CACHE)))
+    key = rasm_cache_key(data.get('umumiy_narx', 0), data.get('boshlangich_tolov', 0), result['muddat'])
+    RASM_FILE_ID_CACHE[key] = file_id
 
 
 # =========================
@@ -99,6 +182,26 @@ def get_muddat_inline_keyboard():
         InlineKeyboardButton("4️⃣ 4 oy", callback_data="muddat_4"),
         InlineKeyboardButton("6️⃣ 6 oy", callback_data="muddat_6")
     )
+    keyboard.add(InlineKeyboardButton("📊 Barcha muddatlarni taqqoslash", callback_data="compare_all"))
+    return keyboard
+
+
+def format_callback_number(num):
+    """Sonni callback_data uchun qisqa ko'rinishga keltirish (1200.0 -> 1200)"""
+    return "{:.2f}".format(num).rstrip('0').rstrip('.')
+
+
+def get_natija_inline_keyboard(data, muddat):
+    """Natija ostidagi klaviatura: to'lov jadvalini yuklab olish va qayta hisoblash"""
+    narx = format_callback_number(data.get('umumiy_narx', 0))
+    boshlangich = format_callback_number(data.get('boshlangich_tolov', 0))
+
+    keyboard = InlineKeyboardMarkup(row_width=3)
+    keyboard.add(*[
+        InlineKeyboardButton(f"📄 {fmt.upper()}", callback_data=f"jadval_{fmt}_{narx}_{boshlangich}_{muddat}")
+        for fmt in available_formats()
+    ])
+    keyboard.add(InlineKeyboardButton("🔄 Qayta hisoblash", callback_data="restart"))
     return keyboard
 
 
@@ -113,8 +216,9 @@ def get_restart_inline_keyboard():
 # RASM YARATISH
 # =========================
 
+@lru_cache(maxsize=1)
 def download_logo():
-    """Logoni yuklab olish - bot papkasidan"""
+    """Logoni yuklab olish - bot papkasidan (bir marta yuklanib, keshda saqlanadi)"""
     try:
         # Bot papkasidagi logo fayllarni tekshirish
         logo_paths = [
@@ -128,7 +232,9 @@ def download_logo():
         for path in logo_paths:
             if os.path.exists(path):
                 logger.info(f"✅ Logo topildi: {path}")
-                return Image.open(path)
+                logo = Image.open(path)
+                logo.load()
+                return logo
 
         logger.warning("⚠️ Logo fayli topilmadi. Logo faylni bot papkasiga joylashtiring (logo.png)")
     except Exception as e:
@@ -137,8 +243,9 @@ def download_logo():
     return None
 
 
+@lru_cache(maxsize=1)
 def load_fonts():
-    """Fontlarni yuklash - ENG KICHIK O'LCHAMLAR"""
+    """Fontlarni yuklash - ENG KICHIK O'LCHAMLAR (bir marta yuklanib, keshda saqlanadi)"""
     fonts = {}
 
     # Barcha mumkin bo'lgan font manzillari
@@ -201,6 +308,68 @@ def load_fonts():
     return fonts
 
 
+def draw_logo_header(img, draw, fonts, width, y_position):
+    """Rasm yuqorisiga logo (yoki matn) chizish, keyingi y_position ni qaytaradi"""
+    header_color = (52, 52, 52)
+
+    logo = download_logo()
+    if logo:
+        try:
+            # Logo o'lchamini sozlash
+            logo_width = 150  # 200 -> 150
+            logo_height = int(logo.height * (logo_width / logo.width))
+            logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+
+            # Logoni markazga joylashtirish
+            logo_x = (width - logo_width) // 2
+            logo_y = y_position
+
+            # Agar logo PNG bo'lsa, shaffoflikni saqlash
+            if logo.mode == 'RGBA':
+                img.paste(logo, (logo_x, logo_y), logo)
+            else:
+                img.paste(logo, (logo_x, logo_y))
+
+            y_position += logo_height + 30
+            logger.info("✅ Logo rasmga qo'shildi")
+        except Exception as e:
+            logger.error(f"❌ Logo joylashtirish xatosi: {e}")
+            # Logo joylashtira olmasa, matn yozish
+            draw.text((width // 2, y_position), "Sebtech", fill=header_color,
+                      font=fonts['title'], anchor="mm")
+            y_position += 65
+    else:
+        # Logo yo'q bo'lsa, matn
+        draw.text((width // 2, y_position), "Sebtech", fill=header_color,
+                  font=fonts['title'], anchor="mm")
+        y_position += 65
+
+    return y_position
+
+
+def draw_footer(draw, fonts, width, y_position):
+    """Rasm pastiga kompaniya nomi va telefonlarni chizish"""
+    header_color = (52, 52, 52)
+    label_color = (120, 120, 120)
+    accent_color = (0, 174, 239)
+
+    y_position += 40  # 45 -> 40
+    draw.text((width // 2, y_position), "Sebtech",
+              fill=header_color, font=fonts['footer'], anchor="mm")
+    y_position += 38  # 40 -> 38
+
+    draw.text((width // 2, y_position), "TRADE IN / NASIYA SAVDO",
+              fill=label_color, font=fonts['footer_small'], anchor="mm")
+    y_position += 36  # 38 -> 36
+
+    draw.text((width // 2, y_position), "+998 (77) 285-99-99",
+              fill=accent_color, font=fonts['phone'], anchor="mm")
+    y_position += 34  # 36 -> 34
+
+    draw.text((width // 2, y_position), "+998 (91) 285-99-99",
+              fill=accent_color, font=fonts['phone'], anchor="mm")
+
+
 def create_result_image(data, result):
     """Chiroyli natija rasmi yaratish"""
     if not PILLOW_AVAILABLE:
@@ -212,7 +381,6 @@ def create_result_image(data, result):
 
         # Ranglar
         bg_color = (255, 255, 255)
-        header_color = (52, 52, 52)
         text_color = (33, 33, 33)
         label_color = (120, 120, 120)
         accent_color = (0, 174, 239)
@@ -226,37 +394,7 @@ def create_result_image(data, result):
         y_position = 25  # 30 -> 25
 
         # HEADER - LOGO
-        logo = download_logo()
-        if logo:
-            try:
-                # Logo o'lchamini sozlash
-                logo_width = 150  # 200 -> 150
-                logo_height = int(logo.height * (logo_width / logo.width))
-                logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-
-                # Logoni markazga joylashtirish
-                logo_x = (width - logo_width) // 2
-                logo_y = y_position
-
-                # Agar logo PNG bo'lsa, shaffoflikni saqlash
-                if logo.mode == 'RGBA':
-                    img.paste(logo, (logo_x, logo_y), logo)
-                else:
-                    img.paste(logo, (logo_x, logo_y))
-
-                y_position += logo_height + 30
-                logger.info("✅ Logo rasmga qo'shildi")
-            except Exception as e:
-                logger.error(f"❌ Logo joylashtirish xatosi: {e}")
-                # Logo joylashtira olmasa, matn yozish
-                draw.text((width // 2, y_position), "Sebtech", fill=header_color,
-                          font=fonts['title'], anchor="mm")
-                y_position += 65
-        else:
-            # Logo yo'q bo'lsa, matn
-            draw.text((width // 2, y_position), "Sebtech", fill=header_color,
-                      font=fonts['title'], anchor="mm")
-            y_position += 65
+        y_position = draw_logo_header(img, draw, fonts, width, y_position)
 
         # HISOB MA'LUMOTLARI SARLAVHA
         draw.text((width // 2, y_position), "HISOB MA'LUMOTLARI",
@@ -346,21 +484,129 @@ def create_result_image(data, result):
         y_position += 150  # 160 -> 150
 
         # FOOTER
-        y_position += 40  # 45 -> 40
-        draw.text((width // 2, y_position), "Sebtech",
-                  fill=header_color, font=fonts['footer'], anchor="mm")
-        y_position += 38  # 40 -> 38
+        draw_footer(draw, fonts, width, y_position)
+
+        # BytesIO ga saqlash
+        img_byte_arr = io.BytesIO()
+        img.save(img_byte_arr, format='PNG', quality=95, optimize=True)
+        img_byte_arr.seek(0)
+
+        return img_byte_arr
+
+    except Exception as e:
+        logger.error(f"Rasm yaratishda xatolik: {e}", exc_info=True)
+        return None
+
+
+def create_comparison_image(data, results):
+    """Barcha muddatlarni bitta rasmda taqqoslash (har bir muddat - alohida ustun)"""
+    if not PILLOW_AVAILABLE:
+        return None
+
+    try:
+        width = 1080
+        height = 1200
+
+        # Ranglar
+        bg_color = (255, 255, 255)
+        text_color = (33, 33, 33)
+        label_color = (120, 120, 120)
+        accent_color = (0, 174, 239)
+        border_color = (220, 220, 220)
+        success_color = (76, 175, 80)
+
+        img = Image.new('RGB', (width, height), bg_color)
+        draw = ImageDraw.Draw(img)
+        fonts = load_fonts()
+
+        y_position = 25
+
+        # HEADER - LOGO
+        y_position = draw_logo_header(img, draw, fonts, width, y_position)
+
+        # HISOB MA'LUMOTLARI SARLAVHA
+        draw.text((width // 2, y_position), "HISOB MA'LUMOTLARI",
+                  fill=text_color, font=fonts['header'], anchor="mm")
+        y_position += 55
+
+        # Ma'lumotlar kartochkasi
+        labels = ["Umumiy narx", "Boshlang'ich", "Qoldiq", "Kurs"]
+        values = [
+            f"${format_number(data['umumiy_narx'])}",
+            f"${format_number(data['boshlangich_tolov'])}",
+            f"${format_number(results[0]['qoldiq_dollar'])}",
+            f"{format_number(DOIMIY_KURS)} so'm"
+        ]
+
+        card_top = y_position
+        card_bottom = card_top + 100
+        draw.rectangle([(40, card_top), (width - 40, card_bottom)],
+                       fill=(255, 255, 255), outline=border_color, width=3)
+
+        col_width = (width - 80) // len(labels)
+
+        for i, (label, value) in enumerate(zip(labels, values)):
+            x_pos = 40 + (i * col_width) + (col_width // 2)
+
+            draw.text((x_pos, card_top + 24), label,
+                      fill=label_color, font=fonts['label'], anchor="mm")
+            draw.text((x_pos, card_top + 66), value,
+                      fill=accent_color, font=fonts['medium'], anchor="mm")
+
+            if i < len(labels) - 1:
+                line_x = 40 + ((i + 1) * col_width)
+                draw.line([(line_x, card_top + 10), (line_x, card_bottom - 10)],
+                          fill=border_color, width=2)
+
+        y_position += 130
+
+        # TAQQOSLASH SARLAVHA
+        draw.text((width // 2, y_position), "MUDDATLARNI TAQQOSLASH",
+                  fill=text_color, font=fonts['header'], anchor="mm")
+        y_position += 55
+
+        # Taqqoslash kartochkasi - har bir muddat uchun ustun
+        card_top = y_position
+        card_bottom = card_top + 420
+        draw.rectangle([(40, card_top), (width - 40, card_bottom)],
+                       fill=(255, 255, 255), outline=border_color, width=3)
 
-        draw.text((width // 2, y_position), "TRADE IN / NASIYA SAVDO",
-                  fill=label_color, font=fonts['footer_small'], anchor="mm")
-        y_position += 36  # 38 -> 36
+        col_width = (width - 80) // len(results)
 
-        draw.text((width // 2, y_position), "+998 (77) 285-99-99",
-                  fill=accent_color, font=fonts['phone'], anchor="mm")
-        y_position += 34  # 36 -> 34
+        for i, result in enumerate(results):
+            col_left = 40 + (i * col_width)
+            x_pos = col_left + (col_width // 2)
 
-        draw.text((width // 2, y_position), "+998 (91) 285-99-99",
-                  fill=accent_color, font=fonts['phone'], anchor="mm")
+            draw.text((x_pos, card_top + 40), f"{result['muddat']} oy",
+                      fill=text_color, font=fonts['header'], anchor="mm")
+
+            draw.text((x_pos, card_top + 100), "Qo'shilgan summa",
+                      fill=label_color, font=fonts['label'], anchor="mm")
+            draw.text((x_pos, card_top + 136), f"{format_number(result['qoshilgan_foyda'])} so'm",
+                      fill=accent_color, font=fonts['value'], anchor="mm")
+
+            draw.text((x_pos, card_top + 190), "Umumiy to'lov",
+                      fill=label_color, font=fonts['label'], anchor="mm")
+            draw.text((x_pos, card_top + 226), f"{format_number(result['umumiy_tolov'])} so'm",
+                      fill=accent_color, font=fonts['value'], anchor="mm")
+
+            # OYLIK TO'LOV
+            draw.rectangle([(col_left + 15, card_top + 280), (col_left + col_width - 15, card_bottom - 20)],
+                           fill=success_color, outline=success_color, width=3)
+            draw.text((x_pos, card_top + 318), "OYLIK TO'LOV",
+                      fill=(255, 255, 255), font=fonts['small'], anchor="mm")
+            draw.text((x_pos, card_top + 360), f"{format_number(result['oylik_tolov'])} so'm",
+                      fill=(255, 255, 255), font=fonts['medium'], anchor="mm")
+
+            if i < len(results) - 1:
+                line_x = col_left + col_width
+                draw.line([(line_x, card_top + 10), (line_x, card_bottom - 10)],
+                          fill=border_color, width=2)
+
+        y_position += 450
+
+        # FOOTER
+        draw_footer(draw, fonts, width, y_position)
 
         # BytesIO ga saqlash
         img_byte_arr = io.BytesIO()
@@ -370,10 +616,22 @@ def create_result_image(data, result):
         return img_byte_arr
 
     except Exception as e:
-        logger.error(f"Rasm yaratishda xatolik: {e}", exc_info=True)
+        logger.error(f"Taqqoslash rasmini yaratishda xatolik: {e}", exc_info=True)
         return None
 
 
+def warm_up_assets():
+    """Font, logo va rasm yaratishni oldindan yuklab qo'yish (birinchi foydalanuvchi kutmasligi uchun)"""
+    if not PILLOW_AVAILABLE:
+        return
+
+    load_fonts()
+    download_logo()
+
+    data = {'umumiy_narx': 1000, 'boshlangich_tolov': 0}
+    create_result_image(data, calculate_nasiya(1000, 0, DOIMIY_KURS, min(KOEFFITSIYENTLAR)))
+
+
 # =========================
 # HANDLERLAR
 # =========================
@@ -402,7 +660,7 @@ async def bot_start(message: types.Message, state: FSMContext):
 async def process_umumiy_narx(message: types.Message, state: FSMContext):
     """Umumiy narxni qabul qilish"""
     try:
-        umumiy_narx = float(message.text.replace(' ', '').replace(',', '.'))
+        umumiy_narx = parse_dollar(message.text)
 
         if umumiy_narx <= 0:
             await message.answer(
@@ -411,6 +669,13 @@ async def process_umumiy_narx(message: types.Message, state: FSMContext):
             )
             return
 
+        if umumiy_narx > MAX_NARX:
+            await message.answer(
+                f"❌ Narx ${format_number(MAX_NARX)} dan oshmasligi kerak!\n\n"
+                "1️⃣ Mahsulotning umumiy narxini USD da kiriting:\n(Masalan: 1000)"
+            )
+            return
+
         await state.update_data(umumiy_narx=umumiy_narx)
 
         await message.answer(
@@ -434,7 +699,7 @@ async def process_boshlangich_tolov(message: types.Message, state: FSMContext):
     umumiy_narx = data.get('umumiy_narx', 0)
 
     try:
-        boshlangich_tolov = float(message.text.replace(' ', '').replace(',', '.'))
+        boshlangich_tolov = parse_dollar(message.text)
 
         if boshlangich_tolov < 0:
             await message.answer(
@@ -487,40 +752,70 @@ async def process_muddat_callback(callback_query: types.CallbackQuery, state: FS
         muddat
     )
 
-    # Rasm yaratish
-    img_byte_arr = create_result_image(data, result)
+    # Rasm yaratish (event loop ni bloklamaslik uchun alohida oqimda)
+    loop = asyncio.get_running_loop()
+    img_byte_arr = await loop.run_in_executor(None, create_result_image, data, result)
 
     # Natijani yuborish
     if img_byte_arr:
         try:
-            await bot.send_photo(
+            sent = await bot.send_photo(
                 callback_query.message.chat.id,
                 photo=img_byte_arr,
                 caption="✅ Hisoblash yakunlandi!",
-                reply_markup=get_restart_inline_keyboard()
+                reply_markup=get_natija_inline_keyboard(data, muddat)
             )
+            remember_rasm_file_id(data, result, sent.photo[-1].file_id)
         except Exception as e:
             logger.error(f"Rasm yuborishda xatolik: {e}")
             img_byte_arr = None
 
     if not img_byte_arr:
         # Matn ko'rinishida yuborish
-        natija = f"📊 <b>Nasiya hisoblash natijasi</b>\n\n"
-        natija += f"🔹 Umumiy narx: ${format_number(data.get('umumiy_narx', 0))}\n"
-        natija += f"🔹 Boshlang'ich to'lov: ${format_number(data.get('boshlangich_tolov', 0))}\n"
-        natija += f"🔹 Qoldiq: ${format_number(result['qoldiq_dollar'])}\n"
-        natija += f"🔹 Kurs: {format_number(DOIMIY_KURS)} so'm\n"
-        natija += f"🔹 Muddat: {result['muddat']} oy\n\n"
+        await bot.send_message(
+            callback_query.message.chat.id,
+            format_natija_text(data, result),
+            parse_mode='HTML',
+            reply_markup=get_natija_inline_keyboard(data, muddat)
+        )
 
-        natija += f"💵 <b>Qoldiq (asosiy):</b> {format_number(result['qoldiq_som'])} so'm\n"
-        natija += f"➕ <b>Qo'shilgan summa:</b> {format_number(result['qoshilgan_foyda'])} so'm\n"
-        natija += f"💰 <b>Umumiy to'lov:</b> {format_number(result['umumiy_tolov'])} so'm\n\n"
+    await state.finish()
 
-        natija += f"💸 <b>Oylik to'lov:</b> {format_number(result['oylik_tolov'])} so'm\n"
 
+@dp.callback_query_handler(lambda c: c.data == 'compare_all', state=NasiyaForm.muddat)
+async def process_compare_all_callback(callback_query: types.CallbackQuery, state: FSMContext):
+    """Barcha muddatlarni taqqoslash - bitta hisob va bitta rasm"""
+    await callback_query.answer()
+
+    data = await state.get_data()
+
+    # Barcha muddatlar bitta chaqiruvda hisoblanadi
+    results = calculate_nasiya_all(
+        data.get('umumiy_narx', 0),
+        data.get('boshlangich_tolov', 0),
+        DOIMIY_KURS,
+        KOEFFITSIYENTLAR
+    )
+
+    loop = asyncio.get_running_loop()
+    img_byte_arr = await loop.run_in_executor(None, create_comparison_image, data, results)
+
+    if img_byte_arr:
+        try:
+            await bot.send_photo(
+                callback_query.message.chat.id,
+                photo=img_byte_arr,
+                caption="✅ Barcha muddatlar taqqoslandi!",
+                reply_markup=get_restart_inline_keyboard()
+            )
+        except Exception as e:
+            logger.error(f"Rasm yuborishda xatolik: {e}")
+            img_byte_arr = None
+
+    if not img_byte_arr:
         await bot.send_message(
             callback_query.message.chat.id,
-            natija,
+            format_taqqoslash_text(data, results),
             parse_mode='HTML',
             reply_markup=get_restart_inline_keyboard()
         )
@@ -528,6 +823,30 @@ async def process_muddat_callback(callback_query: types.CallbackQuery, state: FS
     await state.finish()
 
 
+@dp.callback_query_handler(lambda c: c.data.startswith('jadval_'), state='*')
+async def process_jadval_callback(callback_query: types.CallbackQuery):
+    """To'lov jadvalini fayl ko'rinishida yuborish"""
+    await callback_query.answer()
+
+    _, fmt, narx, boshlangich, muddat = callback_query.data.split('_')
+    data = {'umumiy_narx': float(narx), 'boshlangich_tolov': float(boshlangich)}
+
+    result = calculate_nasiya(data['umumiy_narx'], data['boshlangich_tolov'], DOIMIY_KURS, int(muddat))
+
+    loop = asyncio.get_running_loop()
+    shartnoma = f"${format_number(data['umumiy_narx'])} / ${format_number(data['boshlangich_tolov'])} / {muddat} oy"
+    rows = build_schedule(result, shartnoma=shartnoma)
+    fp = await loop.run_in_executor(None, export_schedule, rows, fmt)
+    try:
+        await bot.send_document(
+            callback_query.message.chat.id,
+            document=types.InputFile(fp, filename=f"tolov_jadvali_{muddat}_oy.{fmt}"),
+            caption=f"📄 To'lov jadvali: ${format_number(data['umumiy_narx'])}, {muddat} oy"
+        )
+    finally:
+        fp.close()
+
+
 @dp.callback_query_handler(lambda c: c.data == 'restart', state='*')
 async def restart_callback(callback_query: types.CallbackQuery, state: FSMContext):
     """Qayta hisoblash"""
@@ -552,7 +871,9 @@ async def help_command(message: types.Message):
         "• 3 oy - 16,000\n"
         "• 4 oy - 17,500\n"
         "• 6 oy - 18,000\n\n"
-        "<b>Doimiy kurs:</b> 12,050 so'm"
+        "<b>Doimiy kurs:</b> 12,050 so'm\n\n"
+        "<b>Tezkor hisoblash:</b> istalgan chatda <code>@bot 1200 300</code> deb yozing "
+        "(narx va boshlang'ich to'lov USD da)"
     )
     await message.answer(help_text, parse_mode='HTML')
 
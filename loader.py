@@ -1,8 +1,16 @@
-from aiogram import Bot, Dispatcher, types
-from aiogram.contrib.fsm_storage.memory import MemoryStorage
+from aiogram import Bot, types
 
 from data import config
+from utils.misc.error_reporter import ErrorReporter
+from utils.misc.health import HealthMonitor
+from utils.misc.scheduler import SchedulingDispatcher, UpdateScheduler
+from utils.misc.storage import CompactJSONStorage
 
 bot = Bot(token=config.BOT_TOKEN, parse_mode=types.ParseMode.HTML)
-storage = MemoryStorage()
-dp = Dispatcher(bot, storage=storage)
+# Holatlar to'xtatishda faylga yoziladi va qayta ishga tushganda tiklanadi
+storage = CompactJSONStorage(config.FSM_STORAGE_PATH)
+scheduler = UpdateScheduler(concurrency=config.UPDATE_CONCURRENCY,
+                            render_concurrency=config.RENDER_CONCURRENCY)
+dp = SchedulingDispatcher(bot, storage=storage, scheduler=scheduler)
+error_reporter = ErrorReporter(bot, config.ADMINS, interval=config.ERROR_DIGEST_INTERVAL)
+health = HealthMonitor(bot, config.FSM_STORAGE_PATH, scheduler, port=config.HEALTH_PORT)
@@ -0,0 +1,194 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from html import escape
+
+from aiogram.utils.exceptions import RetryAfter
+
+logger = logging.getLogger(__name__)
+
+# Loyiha papkasi - xatolik joyi shu papkadagi fayllar bo'yicha aniqlanadi
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Telegram xabari uzunligi chegarasi
+MAX_MESSAGE_LENGTH = 4000
+
+
+class ErrorEntry:
+    """Bitta turdagi (fingerprint) xatolik haqida yig'ilgan ma'lumot"""
+
+    def __init__(self, exc_type, location):
+        self.exc_type = exc_type
+        self.location = location
+        self.total = 0
+        self.window_count = 0
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+        self.last_logged = 0.0
+        self.sample = ''
+        self.notify = False
+
+
+class ErrorReporter:
+    """
+    Xatoliklarni yig'ish va adminlarga qisqa hisobot yuborish.
+
+    Xatoliklar turi va joyi (fayl:qator) bo'yicha guruhlanadi. Har bir guruh
+    `interval` oynasi ichida faqat bir marta to'liq log qilinadi, qolganlari
+    faqat sanaladi. Oyna oxirida hisobot (digest) adminlarga navbat bilan,
+    cheklangan tezlikda yuboriladi.
+    """
+
+    def __init__(self, bot, admins, interval=60, send_delay=1.0, max_entries=200):
+        self.bot = bot
+        self.admins = admins
+        self.interval = interval
+        self.send_delay = send_delay
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._task = None
+        self._stopping = asyncio.Event()
+
+    @staticmethod
+    def is_project_file(filename):
+        """Fayl loyihaga tegishlimi (kutubxonalar va site-packages emas)"""
+        if filename.startswith('<'):
+            # <string>, <frozen ...> kabi fayl bo'lmagan kodlar
+            return False
+        path = os.path.abspath(filename)
+        return (path.startswith(PROJECT_ROOT + os.sep)
+                and 'site-packages' not in path and 'dist-packages' not in path)
+
+    @classmethod
+    def fingerprint(cls, exception):
+        """Xatolik turi va u yuz bergan loyiha ichidagi eng ichki joy"""
+        tb = exception.__traceback__
+        if tb is None:
+            return type(exception).__name__, '?'
+
+        # aiogram xatoliklarining eng ichki joyi doim kutubxona ichida (check_result),
+        # shuning uchun loyiha fayllaridagi oxirgi frame olinadi. Loyiha frame i
+        # bo'lmasa - umuman eng ichki frame
+        last, last_project = None, None
+        while tb is not None:
+            filename = tb.tb_frame.f_code.co_filename
+            last = (filename, tb.tb_lineno)
+            if cls.is_project_file(filename):
+                last_project = last
+            tb = tb.tb_next
+
+        filename, lineno = last_project or last
+        if filename.startswith(PROJECT_ROOT + os.sep):
+            filename = os.path.relpath(filename, PROJECT_ROOT)
+        return type(exception).__name__, f"{filename}:{lineno}"
+
+    @staticmethod
+    def describe_update(update):
+        """Update ni qisqa ko'rinishda tavsiflash (to'liq repr o'rniga)"""
+        if update is None:
+            return 'update=None'
+        kind = next((key for key in update.values if key != 'update_id'), 'unknown')
+        return f"update_id={update.update_id} type={kind}"
+
+    def record(self, exception, update=None, notify=True):
+        """Xatolikni ro'yxatga olish"""
+        exc_type, location = self.fingerprint(exception)
+        key = (exc_type, location)
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = ErrorEntry(exc_type, location)
+            self.entries[key] = entry
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(key)
+
+        now = time.time()
+        entry.total += 1
+        entry.window_count += 1
+        entry.last_seen = now
+        entry.sample = f"{exception} ({self.describe_update(update)})"[:300]
+        entry.notify = entry.notify or notify
+
+        # Oyna ichida har bir turdagi xatolik faqat bir marta to'liq log qilinadi
+        if now - entry.last_logged >= self.interval:
+            entry.last_logged = now
+            logger.error(f"{exc_type} at {location}: {entry.sample}", exc_info=exception)
+
+    def build_digest(self):
+        """Oxirgi oyna uchun hisobot matnini tayyorlash va hisoblagichlarni nolga tushirish"""
+        active = [entry for entry in self.entries.values() if entry.window_count]
+        if not active:
+            return None
+
+        active.sort(key=lambda e: e.window_count, reverse=True)
+        for entry in active:
+            logger.warning(f"{entry.exc_type} at {entry.location}: "
+                           f"{entry.window_count} marta (jami {entry.total})")
+
+        notify = [entry for entry in active if entry.notify]
+        text = None
+        if notify:
+            lines = [f"⚠️ <b>Xatoliklar hisoboti</b> (oxirgi {self.interval} soniya)\n"]
+            for entry in notify:
+                line = (f"\n<b>{escape(entry.exc_type)}</b> × {entry.window_count} (jami {entry.total})\n"
+                        f"<code>{escape(entry.location)}</code>\n"
+                        f"{escape(entry.sample)}\n")
+                if sum(map(len, lines)) + len(line) > MAX_MESSAGE_LENGTH:
+                    lines.append("\n…")
+                    break
+                lines.append(line)
+            text = ''.join(lines)
+
+        for entry in active:
+            entry.window_count = 0
+            entry.notify = False
+
+        return text
+
+    async def send_digest(self):
+        """Hisobotni adminlarga navbat bilan yuborish"""
+        text = self.build_digest()
+        if not text:
+            return
+
+        for admin in self.admins:
+            try:
+                await self.bot.send_message(admin, text)
+            except RetryAfter as e:
+                await asyncio.sleep(e.timeout)
+                try:
+                    await self.bot.send_message(admin, text)
+                except Exception as err:
+                    logger.warning(f"Hisobotni yuborib bo'lmadi ({admin}): {err}")
+            except Exception as err:
+                logger.warning(f"Hisobotni yuborib bo'lmadi ({admin}): {err}")
+            await asyncio.sleep(self.send_delay)
+
+    async def _run(self):
+        while True:
+            # To'xtatish so'ralsa, yuborilayotgan hisobot bekor qilinmaydi - sikl shu yerda tugaydi
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.send_digest()
+            except Exception as err:
+                logger.warning(f"Xatoliklar hisobotida xatolik: {err}")
+
+    def start(self):
+        """Hisobot yuboruvchi fon vazifasini ishga tushirish"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Fon vazifasini to'xtatish va yig'ilgan oxirgi hisobotni yuborish"""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.send_digest()
@@ -0,0 +1,114 @@
+import os
+import time
+import asyncio
+import logging
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Konteyner uchun liveness/readiness HTTP endpointlari.
+
+    /health - event loop javob beryaptimi (loop kechikishi chegaradan oshmaganmi)
+    /ready  - bot foydalanuvchilarga xizmat qilishga tayyormi: loop kechikishi,
+              FSM storage fayliga yozish mumkinligi, Bot API bilan aloqa,
+              resurslar (font, logo) yuklangan va bot to'xtatilmayotgan bo'lishi kerak
+    """
+
+    def __init__(self, bot, storage_path, scheduler, host='0.0.0.0', port=8080,
+                 lag_interval=1.0, max_lag=1.0, api_check_interval=30):
+        self.bot = bot
+        self.storage_path = storage_path
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.lag_interval = lag_interval
+        self.max_lag = max_lag
+        self.api_check_interval = api_check_interval
+
+        self.loop_lag = 0.0
+        self.api_ok = False
+        self.api_checked_at = 0.0
+        self.assets_warm = False
+        self.shutting_down = False
+
+        self._runner = None
+        self._tasks = []
+
+    async def _watch_loop_lag(self):
+        """Event loop kechikishini o'lchash: uyqu kutilganidan qancha ko'p cho'zildi"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(0.0, loop.time() - started - self.lag_interval)
+
+    async def _watch_bot_api(self):
+        """Bot API bilan aloqani vaqti-vaqti bilan tekshirish (har so'rovda emas)"""
+        while True:
+            try:
+                await self.bot.get_me()
+                self.api_ok = True
+            except Exception as err:
+                if self.api_ok:
+                    logger.warning(f"Bot API bilan aloqa yo'q: {err}")
+                self.api_ok = False
+            self.api_checked_at = time.time()
+            await asyncio.sleep(self.api_check_interval)
+
+    def _check_storage(self):
+        """FSM holatlari faylini yozish mumkinmi (faqat tekshiradi, storage ga hech narsa qo'shmaydi)"""
+        if os.path.exists(self.storage_path):
+            return os.path.isfile(self.storage_path) and os.access(self.storage_path, os.W_OK)
+        directory = os.path.dirname(os.path.abspath(self.storage_path))
+        return os.path.isdir(directory) and os.access(directory, os.W_OK)
+
+    def _status(self):
+        return {
+            'loop_lag': round(self.loop_lag, 4),
+            'bot_api': self.api_ok,
+            'bot_api_checked_at': self.api_checked_at,
+            'assets_warm': self.assets_warm,
+            'shutting_down': self.shutting_down,
+            'scheduler': self.scheduler.stats(),
+        }
+
+    async def handle_health(self, request):
+        status = self._status()
+        alive = self.loop_lag < self.max_lag * 5
+        return web.json_response(status, status=200 if alive else 503)
+
+    async def handle_ready(self, request):
+        status = self._status()
+        status['storage'] = self._check_storage()
+        ready = (not self.shutting_down and self.assets_warm and self.api_ok
+                 and status['storage'] and self.loop_lag < self.max_lag)
+        return web.json_response(status, status=200 if ready else 503)
+
+    async def start(self):
+        """HTTP serverni va fon tekshiruvlarini ishga tushirish"""
+        app = web.Application()
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_get('/ready', self.handle_ready)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Health endpoint: http://{self.host}:{self.port}/health, /ready")
+
+        self._tasks = [asyncio.create_task(self._watch_loop_lag()),
+                       asyncio.create_task(self._watch_bot_api())]
+
+    async def close(self):
+        """Fon tekshiruvlari va HTTP serverni to'xtatish"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
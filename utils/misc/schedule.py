@@ -0,0 +1,276 @@
+import io
+import csv
+import calendar
+import datetime
+import itertools
+import tempfile
+from decimal import Decimal, ROUND_HALF_UP
+
+try:
+    from openpyxl import Workbook
+
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# Fayl xotirada shu hajmdan oshsa, vaqtinchalik faylga yoziladi
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Telegram send_document orqali yuboriladigan fayl hajmi chegarasi
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024
+
+# Jadval ustunlari
+SCHEDULE_COLUMNS = ["Shartnoma", "№", "To'lov sanasi", "Oylik to'lov", "Asosiy qarz", "Qo'shilgan summa", "Qoldiq"]
+
+# PDF sahifa o'lchamlari (A4, punktlarda) va joylashuvi
+PDF_PAGE_SIZE = (595, 842)
+PDF_MARGIN = 36
+PDF_FONT_SIZE = 9
+PDF_ROW_HEIGHT = 14
+PDF_COLUMN_WIDTHS = [120, 25, 62, 79, 79, 79, 79]
+PDF_SHARTNOMA_MAX_LENGTH = 24
+
+
+def round_som(value):
+    """Summani butun so'mga yaxlitlash (0.5 yuqoriga)"""
+    # to_integral_value kontekst aniqligiga (28 xona) bog'liq emas, katta summalarda ham ishlaydi
+    return int(Decimal(str(value)).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def add_months(sana, oylar):
+    """Sanaga oy qo'shish (oy oxiridan oshib ketsa, oxirgi kunga tushiriladi)"""
+    oy_index = sana.month - 1 + oylar
+    yil = sana.year + oy_index // 12
+    oy = oy_index % 12 + 1
+    kun = min(sana.day, calendar.monthrange(yil, oy)[1])
+    return datetime.date(yil, oy, kun)
+
+
+def build_schedule(result, boshlanish_sana=None, shartnoma=''):
+    """
+    calculate_nasiya natijasidan oyma-oy to'lov jadvalini yaratish.
+
+    Qatorlar generator orqali birma-bir qaytariladi. Summalar butun so'mga
+    yaxlitlanadi va qoldiqlar oylar bo'yicha taqsimlanadi, shuning uchun
+    ustunlar yig'indisi umumiy summalarga aynan teng bo'ladi.
+
+    :param result: calculate_nasiya() qaytargan dict
+    :param boshlanish_sana: shartnoma sanasi (default - bugun)
+    :param shartnoma: shartnoma/mijoz nomi (har bir qatorga yoziladi)
+    :return: dict qatorlar generatori
+    """
+    if boshlanish_sana is None:
+        boshlanish_sana = datetime.date.today()
+
+    muddat = result['muddat']
+    asosiy = round_som(result['qoldiq_som'])
+    foyda = round_som(result['qoshilgan_foyda'])
+    umumiy = asosiy + foyda
+
+    tolangan = 0
+    for oy in range(1, muddat + 1):
+        # Yig'ma yaxlitlash: i-oygacha bo'lgan ulush - (i-1)-oygacha bo'lgan ulush
+        oylik_asosiy = asosiy * oy // muddat - asosiy * (oy - 1) // muddat
+        oylik_foyda = foyda * oy // muddat - foyda * (oy - 1) // muddat
+        oylik_tolov = oylik_asosiy + oylik_foyda
+        tolangan += oylik_tolov
+
+        yield {
+            'shartnoma': shartnoma,
+            'raqam': oy,
+            'sana': add_months(boshlanish_sana, oy),
+            'oylik_tolov': oylik_tolov,
+            'asosiy': oylik_asosiy,
+            'foyda': oylik_foyda,
+            'qoldiq': umumiy - tolangan,
+        }
+
+
+def build_schedules(contracts):
+    """
+    Bir nechta shartnoma jadvallarini bitta qatorlar oqimiga birlashtirish.
+
+    :param contracts: (shartnoma, result, boshlanish_sana) lar ketma-ketligi
+    :return: barcha shartnomalar qatorlari generatori (shartnoma ustuni bilan)
+    """
+    return itertools.chain.from_iterable(
+        build_schedule(result, boshlanish_sana, shartnoma)
+        for shartnoma, result, boshlanish_sana in contracts
+    )
+
+
+def schedule_row_values(row):
+    """Jadval qatorini ustunlar tartibidagi ro'yxatga aylantirish"""
+    return [row['shartnoma'], row['raqam'], row['sana'], row['oylik_tolov'],
+            row['asosiy'], row['foyda'], row['qoldiq']]
+
+
+def write_csv(rows, fp):
+    """Jadvalni CSV ko'rinishida binar faylga yozish"""
+    text = io.TextIOWrapper(fp, encoding='utf-8-sig', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(SCHEDULE_COLUMNS)
+    for row in rows:
+        values = schedule_row_values(row)
+        values[2] = values[2].isoformat()
+        writer.writerow(values)
+    # TextIOWrapper yopilganda fp ham yopilmasligi uchun
+    text.detach()
+
+
+def write_xlsx(rows, fp):
+    """Jadvalni XLSX ko'rinishida yozish (write_only - qatorlar xotirada saqlanmaydi)"""
+    if not OPENPYXL_AVAILABLE:
+        raise RuntimeError("openpyxl kutubxonasi o'rnatilmagan")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Jadval")
+    ws.append(SCHEDULE_COLUMNS)
+    for row in rows:
+        ws.append(schedule_row_values(row))
+    wb.save(fp)
+
+
+def pdf_text(value):
+    """PDF standart fonti (WinAnsi) uchun matnni tayyorlash"""
+    text = str(value).replace('№', 'No')
+    text = text.encode('cp1252', errors='replace')
+    return text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def pdf_text_width(text):
+    """Helvetica da matn kengligini taxminan hisoblash (1000 birlikda)"""
+    return sum(278 if ch in " '.,:;il" else 556 for ch in text)
+
+
+class PdfWriter:
+    """
+    Oddiy matnli PDF yozuvchi.
+
+    Sahifalar tayyor bo'lishi bilan faylga yoziladi, xotirada faqat
+    sahifalar ro'yxati (obyekt raqamlari) saqlanadi.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.offsets = {}
+        self.page_ids = []
+        # 1 - catalog, 2 - pages, 3 - font, 4 - qalin font
+        self.next_id = 5
+        self.fp.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        self._write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+        self._write_object(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+                              b'/Encoding /WinAnsiEncoding >>')
+
+    def _write_object(self, obj_id, body):
+        self.offsets[obj_id] = self.fp.tell()
+        self.fp.write(b'%d 0 obj\n' % obj_id + body + b'\nendobj\n')
+
+    def add_page(self, content):
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._write_object(content_id, b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        self._write_object(page_id, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                                    b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>'
+                           % (PDF_PAGE_SIZE[0], PDF_PAGE_SIZE[1], content_id))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+        self._write_object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_ids)))
+
+        xref_offset = self.fp.tell()
+        self.fp.write(b'xref\n0 %d\n0000000000 65535 f \n' % self.next_id)
+        for obj_id in range(1, self.next_id):
+            self.fp.write(b'%010d 00000 n \n' % self.offsets[obj_id])
+        self.fp.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                      % (self.next_id, xref_offset))
+
+
+def write_pdf(rows, fp, title="To'lov jadvali"):
+    """
+    Jadvalni matnli PDF ko'rinishida yozish (standart Helvetica fonti).
+
+    Har bir sahifa to'lgan zahoti faylga yoziladi. Qator ~60 bayt joy oladi,
+    shuning uchun 50 MB chegarasiga faqat yuz minglab qatorlarda yetiladi.
+    """
+    width, height = PDF_PAGE_SIZE
+    rows_per_page = (height - 2 * PDF_MARGIN - 50) // PDF_ROW_HEIGHT - 1
+    writer = PdfWriter(fp)
+
+    col_x = [PDF_MARGIN + sum(PDF_COLUMN_WIDTHS[:i]) for i in range(len(PDF_COLUMN_WIDTHS))]
+
+    def cell(col, y, text, font=b'F1', right=False):
+        x = col_x[col]
+        if right:
+            x += PDF_COLUMN_WIDTHS[col] - 4 - pdf_text_width(text) * PDF_FONT_SIZE / 1000
+        return b'BT /%s %d Tf %.1f %.1f Td (%s) Tj ET\n' % (font, PDF_FONT_SIZE, x, y, pdf_text(text))
+
+    def page_header():
+        y = height - PDF_MARGIN - 14
+        parts = [b'BT /F2 14 Tf %d %d Td (%s) Tj ET\n' % (PDF_MARGIN, y, pdf_text(title))]
+        y -= 30
+        parts += [cell(col, y, name, font=b'F2', right=col > 2) for col, name in enumerate(SCHEDULE_COLUMNS)]
+        parts.append(b'%d %.1f m %d %.1f l S\n' % (PDF_MARGIN, y - 4, width - PDF_MARGIN, y - 4))
+        return parts, y
+
+    parts, y = page_header()
+    on_page = 0
+
+    for row in rows:
+        if on_page == rows_per_page:
+            writer.add_page(b''.join(parts))
+            parts, y = page_header()
+            on_page = 0
+
+        values = schedule_row_values(row)
+        values[2] = values[2].strftime('%d.%m.%Y')
+        y -= PDF_ROW_HEIGHT
+        values[0] = values[0][:PDF_SHARTNOMA_MAX_LENGTH]
+        for col, value in enumerate(values):
+            if isinstance(value, int):
+                parts.append(cell(col, y, "{:,}".format(value).replace(',', ' '), right=col > 2))
+            else:
+                parts.append(cell(col, y, value))
+        on_page += 1
+
+    writer.add_page(b''.join(parts))
+    writer.close()
+
+
+EXPORT_WRITERS = {
+    'csv': write_csv,
+    'xlsx': write_xlsx,
+    'pdf': write_pdf,
+}
+
+
+def available_formats():
+    """Ushbu muhitda mavjud eksport formatlari"""
+    formats = ['csv']
+    if OPENPYXL_AVAILABLE:
+        formats.append('xlsx')
+    formats.append('pdf')
+    return formats
+
+
+def export_schedule(rows, fmt):
+    """
+    Jadval qatorlarini tanlangan formatda faylga yozish.
+
+    Kichik fayllar xotirada, kattalari vaqtinchalik faylda saqlanadi.
+    Bir nechta shartnomani bitta faylga chiqarish uchun rows sifatida
+    build_schedules(...) berish mumkin.
+
+    :return: boshiga qaytarilgan fayl obyekti (send_document uchun)
+    :raises ValueError: fayl Telegram chegarasidan (MAX_DOCUMENT_SIZE) katta bo'lsa
+    """
+    writer = EXPORT_WRITERS[fmt]
+    fp = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode='w+b')
+    writer(rows, fp)
+    if fp.tell() > MAX_DOCUMENT_SIZE:
+        fp.close()
+        raise ValueError(f"Fayl hajmi {MAX_DOCUMENT_SIZE} baytdan katta")
+    fp.seek(0)
+    return fp
@@ -0,0 +1,249 @@
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+from aiogram import Dispatcher, types
+
+# Update turlari (navbatlar)
+LANE_CHEAP = 'cheap'
+LANE_RENDER = 'render'
+
+# Rasm/fayl yaratadigan callback_data prefikslari
+RENDER_CALLBACK_PREFIXES = ('muddat_', 'compare_all', 'jadval_')
+
+
+class LaneStats:
+    """Bitta navbat uchun metrikalar"""
+
+    def __init__(self):
+        self.running = 0
+        # Slot olmagan update lar: chat navbatida yoki navbat slotini kutayotganlar
+        self.queued = 0
+        self.processed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.waiters = deque()
+
+    def record_wait(self, wait):
+        self.processed += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def as_dict(self):
+        return {
+            'queue_depth': self.queued,
+            'waiting_for_chat': self.queued - len(self.waiters),
+            'running': self.running,
+            'processed': self.processed,
+            'wait_avg': self.wait_total / self.processed if self.processed else 0.0,
+            'wait_max': self.wait_max,
+        }
+
+
+class UpdateScheduler:
+    """
+    Update larni qayta ishlash navbati.
+
+    - Bir vaqtda ishlanadigan update lar soni `concurrency` bilan cheklanadi.
+    - Rasm chizadigan update lar alohida `render_concurrency` navbatida ishlaydi,
+      shuning uchun arzon update lar uchun doim bo'sh joy qoladi.
+    - Slot bo'shaganda avval arzon update lar, keyin render update lar kiritiladi.
+    - Bitta chat update lari kelish tartibida, ketma-ket ishlanadi.
+    """
+
+    def __init__(self, concurrency=8, render_concurrency=2, render_prefixes=RENDER_CALLBACK_PREFIXES):
+        if render_concurrency >= concurrency:
+            raise ValueError("render_concurrency must be less than concurrency")
+
+        self.concurrency = concurrency
+        self.render_concurrency = render_concurrency
+        self.render_prefixes = render_prefixes
+        self.lanes = {LANE_CHEAP: LaneStats(), LANE_RENDER: LaneStats()}
+        self._chat_locks = {}
+        # slot() ga kirgan, lekin hali tugamagan update lar (chat navbatidagilar ham)
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def running(self):
+        return sum(lane.running for lane in self.lanes.values())
+
+    def classify(self, update: types.Update):
+        """Update qaysi navbatga tegishli ekanini aniqlash"""
+        callback = update.callback_query
+        if callback and callback.data and callback.data.startswith(self.render_prefixes):
+            return LANE_RENDER
+        return LANE_CHEAP
+
+    @staticmethod
+    def chat_key(update: types.Update):
+        """Update qaysi chatga tegishli (inline so'rovlar uchun None)"""
+        if update.message:
+            return update.message.chat.id
+        if update.edited_message:
+            return update.edited_message.chat.id
+        if update.callback_query and update.callback_query.message:
+            return update.callback_query.message.chat.id
+        return None
+
+    def _can_start(self, lane_name):
+        if self.running >= self.concurrency:
+            return False
+        if lane_name == LANE_RENDER:
+            return self.lanes[LANE_RENDER].running < self.render_concurrency
+        return True
+
+    def _wake_waiters(self):
+        """Bo'sh slotlarni kutayotganlarga berish (avval arzon navbat)"""
+        for lane_name in (LANE_CHEAP, LANE_RENDER):
+            lane = self.lanes[lane_name]
+            while lane.waiters and self._can_start(lane_name):
+                waiter = lane.waiters.popleft()
+                if waiter.done():
+                    continue
+                lane.running += 1
+                waiter.set_result(None)
+
+    async def _acquire(self, lane_name):
+        lane = self.lanes[lane_name]
+        cheap_waiting = lane_name == LANE_RENDER and self.lanes[LANE_CHEAP].waiters
+
+        if not lane.waiters and not cheap_waiting and self._can_start(lane_name):
+            lane.running += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        lane.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot berilgan, lekin task bekor qilingan
+                self._release(lane_name)
+            elif waiter in lane.waiters:
+                lane.waiters.remove(waiter)
+                self._wake_waiters()
+            raise
+
+    def _release(self, lane_name):
+        self.lanes[lane_name].running -= 1
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def _chat_lock(self, key):
+        if key is None:
+            yield
+            return
+
+        lock, users = self._chat_locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._chat_locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._chat_locks[key]
+            if users == 1:
+                del self._chat_locks[key]
+            else:
+                self._chat_locks[key] = (lock, users - 1)
+
+    @asynccontextmanager
+    async def slot(self, update: types.Update):
+        """Update ni ishlash uchun navbatdan joy olish"""
+        lane_name = self.classify(update)
+        lane = self.lanes[lane_name]
+        started = time.monotonic()
+
+        self._in_flight += 1
+        self._idle.clear()
+        lane.queued += 1
+        queued = True
+        try:
+            async with self._chat_lock(self.chat_key(update)):
+                await self._acquire(lane_name)
+                lane.queued -= 1
+                queued = False
+                lane.record_wait(time.monotonic() - started)
+                try:
+                    yield
+                finally:
+                    self._release(lane_name)
+        finally:
+            if queued:
+                lane.queued -= 1
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    @property
+    def pending(self):
+        """Ishlayotgan va navbatda turgan (chat navbatidagilar bilan) update lar soni"""
+        return self._in_flight
+
+    async def drain(self, timeout):
+        """Barcha update lar tugashini kutish. Vaqt tugasa False qaytaradi"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def stats(self):
+        """Navbatlar holati: chuqurlik, ishlayotganlar va kutish vaqtlari (soniya)"""
+        return {
+            'concurrency': self.concurrency,
+            'render_concurrency': self.render_concurrency,
+            'running': self.running,
+            'pending': self.pending,
+            'lanes': {name: lane.as_dict() for name, lane in self.lanes.items()},
+        }
+
+
+class SchedulingDispatcher(Dispatcher):
+    """Har bir update ni UpdateScheduler orqali ishlaydigan Dispatcher"""
+
+    def __init__(self, *args, scheduler: UpdateScheduler = None, **kwargs):
+        super(SchedulingDispatcher, self).__init__(*args, **kwargs)
+        self.scheduler = scheduler or UpdateScheduler()
+        self._polling_task = None
+
+    async def process_update(self, update: types.Update):
+        async with self.scheduler.slot(update):
+            return await super(SchedulingDispatcher, self).process_update(update)
+
+    async def start_polling(self, *args, **kwargs):
+        # To'xtatishda kutilayotgan getUpdates so'rovini bekor qilish uchun
+        self._polling_task = asyncio.current_task()
+        return await super(SchedulingDispatcher, self).start_polling(*args, **kwargs)
+
+    async def close_polling(self, timeout):
+        """
+        Polling ni to'xtatish va olingan update lar tugashini kutish.
+
+        stop_polling() kutilayotgan getUpdates so'rovini to'xtatmaydi, shuning uchun
+        polling vazifasi bekor qilinadi. Bekor qilingan so'rov update lari tasdiqlanmaydi
+        va Telegram ularni keyingi ishga tushishda qayta yuboradi.
+
+        :return: hammasi `timeout` soniya ichida tugasa True
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        self.stop_polling()
+        if self._polling_task is not None and not self._polling_task.done():
+            self._polling_task.cancel()
+            await asyncio.wait([self._polling_task], timeout=timeout)
+            if not self._polling_task.done():
+                return False
+
+        # Olingan, lekin hali slot() ga kirmagan update lar ham shu vazifalar ichida
+        if self._polling_tasks:
+            _, pending = await asyncio.wait(set(self._polling_tasks), timeout=max(0.0, deadline - loop.time()))
+            if pending:
+                return False
+
+        return await self.scheduler.drain(max(0.0, deadline - loop.time()))
@@ -0,0 +1,33 @@
+import pathlib
+
+from aiogram.contrib.fsm_storage.files import JSONStorage
+from aiogram.utils import json
+
+
+class CompactJSONStorage(JSONStorage):
+    """
+    Faqat kerakli holatlarni saqlaydigan JSONStorage.
+
+    Faylga holati yoki ma'lumoti bor yozuvlar yoziladi. Throttling bucket lari va
+    bot bilan bir marta yozishgan har bir chatning bo'sh yozuvlari tashlab yuboriladi,
+    aks holda fayl cheksiz o'sib boradi.
+    """
+
+    def compact_data(self):
+        """Saqlanadigan yozuvlar (bucket lar bo'shatilgan nusxa)"""
+        compact = {}
+        for chat_id, users in self.data.items():
+            for user_id, entry in users.items():
+                if entry.get('state') is None and not entry.get('data'):
+                    continue
+                # Qayta yuklanganda get_bucket() ishlashi uchun kalit qoldiriladi
+                compact.setdefault(chat_id, {})[user_id] = {
+                    'state': entry.get('state'),
+                    'data': entry.get('data', {}),
+                    'bucket': {},
+                }
+        return compact
+
+    def write(self, path: pathlib.Path):
+        with path.open('w') as f:
+            return json.dump(self.compact_data(), f, indent=4)